@@ -59,6 +59,21 @@ def main():
         default=None,
         help="Override VBR quality (0=best ... 9=worst)",
     )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the resolved folder, archive and yt-dlp command without running yt-dlp",
+    )
+    parser.add_argument(
+        "--refresh-metadata",
+        action="store_true",
+        help="Ignore cached collection info and query yt-dlp again",
+    )
+    parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Print output dir, archive path and the full yt-dlp command",
+    )
     args = parser.parse_args()
 
     print(f"[tiktok-collection-dl] v{__version__}")
@@ -69,6 +84,12 @@ def main():
         cfg["audio_format"] = args.audio_format
     if args.audio_quality:
         cfg["audio_quality"] = args.audio_quality
+    if args.dry_run:
+        cfg["dry_run"] = True
+    if args.refresh_metadata:
+        cfg["refresh_metadata"] = True
+    if args.verbose:
+        cfg["verbose"] = True
 
     # -----------------------------------------------------------------------
     # Smart disambiguation:
@@ -31,6 +31,11 @@ DEFAULTS: Dict[str, Any] = {
     # Ugly fix: pass --windows-filenames to yt-dlp so illegal chars become _
     # instead of being percent-encoded (e.g. %3F -> _)
     "windows_safe_filenames":              False,
+    # Seconds to reuse collection info cached in .yt-dlp-archive-<hash>.meta.json
+    # (0 disables the cache)
+    "info_cache_ttl":                      86400,
+    # Print output dir, archive path and the full yt-dlp command
+    "verbose":                             False,
     "default_output_dir":                  None,
     "extra_yt_dlp_args":                   [],
 }
@@ -1,20 +1,86 @@
 from __future__ import annotations
-import hashlib
+import os
 import re
-import subprocess
 import sys
-import urllib.parse
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+# hashlib, json, subprocess, time and urllib.parse are imported where they are
+# used so that `--help` and early config errors don't pay for loading them.
+
 
 # ---------------------------------------------------------------------------
 # Archive path
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=256)
+def _url_hash(url: str) -> str:
+    import hashlib
+
+    # Plain filename disambiguator, no need for a cryptographic-strength hash.
+    # Memoized: the archive, info cache and migration paths all hash the URL.
+    return hashlib.blake2b(url.encode(), digest_size=6).hexdigest()
+
+
 def get_archive_path(out_dir: Path, url: str) -> Path:
-    url_hash = hashlib.sha256(url.encode()).hexdigest()[:12]
-    return out_dir / f".yt-dlp-archive-{url_hash}.txt"
+    return out_dir / f".yt-dlp-archive-{_url_hash(url)}.txt"
+
+
+def migrate_legacy_archive(out_dir: Path, url: str) -> None:
+    """Rename an archive named with the old SHA-256 prefix to the current name."""
+    import hashlib
+
+    archive = get_archive_path(out_dir, url)
+    legacy  = out_dir / f".yt-dlp-archive-{hashlib.sha256(url.encode()).hexdigest()[:12]}.txt"
+    if legacy.is_file() and not archive.exists():
+        try:
+            legacy.rename(archive)
+            print(f"[tiktok-collection-dl] Migrated archive: {legacy.name} -> {archive.name}")
+        except OSError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Collection info cache
+# ---------------------------------------------------------------------------
+
+def get_info_cache_path(out_dir: Path, url: str) -> Path:
+    """
+    .yt-dlp-archive-<hash>.meta.json inside out_dir (same hash as the archive).
+    run() passes the base output directory, since the collection subfolder
+    name depends on the cached info itself.
+    """
+    return get_archive_path(out_dir, url).with_suffix(".meta.json")
+
+
+def load_cached_info(path: Path, ttl: float) -> Optional[Dict[str, Optional[str]]]:
+    """Return cached collection info if present and younger than ttl seconds."""
+    import json
+    import time
+
+    try:
+        if time.time() - path.stat().st_mtime >= ttl:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    return {f: data.get(f) for f in _SUPPORTED_FIELDS}
+
+
+def save_cached_info(path: Path, info: Dict[str, Optional[str]]) -> None:
+    """Best effort — a failed cache write must never break a download."""
+    import json
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(info, f, ensure_ascii=False)
+    except OSError:
+        pass
 
 
 # ---------------------------------------------------------------------------
@@ -22,61 +88,115 @@ def get_archive_path(out_dir: Path, url: str) -> Path:
 # ---------------------------------------------------------------------------
 
 _SUPPORTED_FIELDS = ("uploader", "playlist_title")
-_DELIM = "|||"
+
+_COLLECTION_URL_RE = re.compile(r'/collection/(.+?)-(\d{10,})(?:[/?#]|$)')
+_PLACEHOLDER_RE    = re.compile(r"%\(([^)]+)\)s")
+_WS_RE             = re.compile(r"\s+")
+
+# Characters illegal in Windows folder names + ASCII control chars -> deleted
+_SANITIZE_TABLE = dict.fromkeys([*range(0x20), *map(ord, '<>:"/\\|?*')])
+
+
+def _unquote(value: str) -> str:
+    """Percent-decode, skipping urllib entirely when there is nothing to decode."""
+    if "%" not in value:
+        return value
+    import urllib.parse
+    return urllib.parse.unquote(value)
 
 
+@lru_cache(maxsize=256)
 def extract_title_from_tiktok_url(url: str) -> Optional[str]:
     """
     Extract and URL-decode the collection name from a TikTok collection URL.
     Format: https://www.tiktok.com/@username/collection/CollectionName-NumericID
     The numeric ID is always >= 10 digits to avoid false matches.
+    Memoized: run() and the info probe both ask for the same URL.
     """
-    match = re.search(r'/collection/(.+?)-(\d{10,})(?:[/?#]|$)', url)
+    if "/collection/" not in url:
+        return None
+    match = _COLLECTION_URL_RE.search(url)
     if match:
-        decoded = urllib.parse.unquote(match.group(1))
-        return decoded.strip() or None
+        return _unquote(match.group(1)).strip() or None
     return None
 
 
+def needs_uploader(cfg: Dict[str, Any]) -> bool:
+    """True if the active config actually consumes the uploader field."""
+    if not cfg.get("use_collection_folder"):
+        return False
+    template = cfg.get("collection_folder_template") or ""
+    return "%(uploader)s" in template
+
+
 def get_collection_info(url: str) -> Dict[str, Optional[str]]:
     """
     Fetch collection metadata.
     Title is always sourced from the URL (primary) since yt-dlp's playlist_title
     often contains the uploader prefix and percent-encoded characters.
-    Uploader is fetched from yt-dlp as a secondary call.
+    Uploader is fetched from yt-dlp as a secondary call. Whether that call is
+    needed at all is decided by run().
     """
-    info: Dict[str, Optional[str]] = {f: None for f in _SUPPORTED_FIELDS}
+    import json
+    import subprocess
 
-    # Step 1: clean title from URL
-    url_title = extract_title_from_tiktok_url(url)
-    if url_title:
-        info["playlist_title"] = url_title
-        print(f"[tiktok-collection-dl] playlist_title (URL): {url_title!r}")
-
-    # Step 2: yt-dlp for uploader + title fallback only
-    print_template = _DELIM.join(f"%({f})s" for f in _SUPPORTED_FIELDS)
     cmd = [
         "yt-dlp",
+        "--dump-single-json",
         "--flat-playlist",
         "--playlist-items", "1",
-        "--print", print_template,
+        "--skip-download",
+        "--no-progress",
         "--no-warnings",
+        # Probe only — fail fast rather than hang on a slow connection
+        "--socket-timeout", "10",
+        "--retries", "1",
         url,
     ]
+    # --dump-single-json prints the whole playlist as one line: read it, then
+    # stop yt-dlp instead of buffering (and decoding) stderr.
+    line = ""
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        line = result.stdout.strip().splitlines()[0] if result.stdout.strip() else ""
-        parts = line.split(_DELIM)
-        for i, field in enumerate(_SUPPORTED_FIELDS):
-            raw = parts[i].strip() if i < len(parts) else ""
-            if raw and raw.upper() != "NA":
-                decoded = urllib.parse.unquote(raw)
-                if field == "playlist_title" and info["playlist_title"]:
-                    pass  # URL already gave us a clean title
-                else:
-                    info[field] = decoded
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
     except FileNotFoundError:
-        pass
+        proc = None
+    if proc is not None:
+        try:
+            line = proc.stdout.readline().decode("utf-8", "replace").strip()
+        finally:
+            proc.stdout.close()
+            proc.terminate()
+            try:
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+    info: Dict[str, Optional[str]] = dict.fromkeys(_SUPPORTED_FIELDS)
+
+    # Step 1: clean title from URL
+    url_title = extract_title_from_tiktok_url(url)
+    if url_title:
+        info["playlist_title"] = url_title
+        print(f"[tiktok-collection-dl] playlist_title (URL): {url_title!r}")
+
+    # Step 2: yt-dlp for uploader + title fallback only
+    try:
+        data = json.loads(line) if line else {}
+    except ValueError:
+        data = {}
+    if not isinstance(data, dict):
+        return info
+
+    # The uploader may only be present on the (single, flat) entry
+    entries = data.get("entries") or []
+    first   = entries[0] if entries and isinstance(entries[0], dict) else {}
+
+    info["uploader"] = data.get("uploader") or first.get("uploader") or None
+    if not info["playlist_title"]:
+        title = data.get("playlist_title") or data.get("title")
+        if title:
+            info["playlist_title"] = _unquote(title)
 
     return info
 
@@ -87,31 +207,30 @@ def strip_uploader_prefix(info: Dict[str, Optional[str]]) -> Dict[str, Optional[
     uploader = info.get("uploader") or ""
     if not (title and uploader):
         return info
-    if title.lower().startswith(uploader.lower()):
-        stripped = title[len(uploader):].lstrip("-_ ")
+    n = len(uploader)
+    if n > len(title):
+        return info
+    # Only fold the head of the title — casefold() also handles non-ASCII names
+    if title[:n].casefold() == uploader.casefold():
+        stripped = title[n:].lstrip("-_ ")
         if stripped:
             print(
                 f"[tiktok-collection-dl] strip_uploader_from_collection_title: "
                 f"{title!r} -> {stripped!r}"
             )
-            info = dict(info)
-            info["playlist_title"] = stripped
+            # New dict — never mutate the caller's (possibly cached) info
+            return {**info, "playlist_title": stripped}
     return info
 
 
 def apply_folder_template(template: str, info: Dict[str, Optional[str]]) -> str:
-    result = template
-    for field, value in info.items():
-        result = result.replace(f"%({field})s", value or "")
-    result = re.sub(r"%\([^)]+\)s", "", result)
+    # One pass over the template; unknown placeholders resolve to ""
+    result = _PLACEHOLDER_RE.sub(lambda m: info.get(m.group(1)) or "", template)
     return sanitize_folder_name(result) or "collection"
 
 
 def sanitize_folder_name(name: str) -> str:
-    name = re.sub(r'[<>:"/\\|?*]', "", name)
-    name = re.sub(r"[\x00-\x1f]", "", name)
-    name = re.sub(r"\s+", " ", name).strip()
-    return name
+    return _WS_RE.sub(" ", name.translate(_SANITIZE_TABLE)).strip()
 
 
 # ---------------------------------------------------------------------------
@@ -132,7 +251,8 @@ def metadata_flags(cfg: Dict[str, Any], album_name: Optional[str] = None) -> Lis
       3. --add-metadata                               -> ffmpeg embeds clean album
     """
     flags: List[str] = []
-    extra = cfg.get("extra_yt_dlp_args") or []
+    # Set of user-supplied args, for O(1) "already passed?" checks
+    extra = frozenset(cfg.get("extra_yt_dlp_args") or ())
 
     if cfg.get("embed_collection_as_album"):
         if album_name:
@@ -141,7 +261,8 @@ def metadata_flags(cfg: Dict[str, Any], album_name: Optional[str] = None) -> Lis
                 "--parse-metadata", "playlist_title:%(album)s",
                 # Immediately overwrite with our clean Python-resolved title.
                 # .+ matches any non-empty value; leaves untouched if somehow empty.
-                "--replace-in-metadata", "album", ".+", album_name,
+                # yt-dlp feeds the replacement to re.sub, so escape backslashes.
+                "--replace-in-metadata", "album", ".+", album_name.replace("\\", "\\\\"),
             ]
         else:
             # No clean title available — fall back to yt-dlp's field directly
@@ -150,7 +271,7 @@ def metadata_flags(cfg: Dict[str, Any], album_name: Optional[str] = None) -> Lis
         if "--add-metadata" not in extra:
             flags.append("--add-metadata")
 
-    if cfg.get("windows_safe_filenames"):
+    if cfg.get("windows_safe_filenames") and "--windows-filenames" not in extra:
         flags.append("--windows-filenames")
 
     return flags
@@ -167,68 +288,172 @@ def build_command(
     cfg: Dict[str, Any],
     album_name: Optional[str] = None,
 ) -> List[str]:
-    cmd = [
+    # Stringify the paths once up front; the list below is plain str data
+    output_path  = os.fspath(out_dir / cfg["output_template"])
+    archive_path = os.fspath(archive)
+
+    opt_flags: List[str] = []
+    if cfg.get("no_overwrites"):
+        opt_flags.append("--no-overwrites")
+    if cfg.get("ignore_errors"):
+        opt_flags.append("--ignore-errors")
+
+    return [
         "yt-dlp",
         "--format",           "bestaudio/best",
         "--extract-audio",
         "--audio-format",     cfg["audio_format"],
         "--audio-quality",    str(cfg["audio_quality"]),
-        "--output",           str(out_dir / cfg["output_template"]),
-        "--download-archive", str(archive),
+        "--output",           output_path,
+        "--download-archive", archive_path,
         "--console-title",
+        *opt_flags,
+        *metadata_flags(cfg, album_name=album_name),
+        *(cfg.get("extra_yt_dlp_args") or []),
+        url,
     ]
-    if cfg.get("no_overwrites"):
-        cmd.append("--no-overwrites")
-    if cfg.get("ignore_errors"):
-        cmd.append("--ignore-errors")
-
-    cmd.extend(metadata_flags(cfg, album_name=album_name))
-
-    if cfg.get("extra_yt_dlp_args"):
-        cmd.extend(cfg["extra_yt_dlp_args"])
-
-    cmd.append(url)
-    return cmd
 
 
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
 
+def _emit(lines: List[str]) -> None:
+    """Write a block of status lines with a single write + flush."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def _info_complete(info: Optional[Dict[str, Optional[str]]], need_uploader: bool) -> bool:
+    """True if info has a title, and an uploader when the template needs one."""
+    return bool(info and info.get("playlist_title") and (info.get("uploader") or not need_uploader))
+
+
+def _fetch_collection_info(
+    url: str,
+    base_out_dir: Path,
+    cfg: Dict[str, Any],
+    need_uploader: bool,
+) -> Dict[str, Optional[str]]:
+    """
+    get_collection_info() behind the on-disk info cache.
+    refresh_metadata skips the lookup; a complete fresh result is cached again.
+    """
+    cache_path = get_info_cache_path(base_out_dir, url)
+    cache_ttl  = cfg.get("info_cache_ttl") or 0
+    use_cache  = cache_ttl and not cfg.get("refresh_metadata")
+    info       = load_cached_info(cache_path, cache_ttl) if use_cache else None
+    if _info_complete(info, need_uploader):
+        print(f"[tiktok-collection-dl] Collection info (cached): {cache_path}")
+        return info
+
+    print("[tiktok-collection-dl] Fetching collection info...")
+    info = get_collection_info(url)
+    # A failed probe (no yt-dlp, timeout) must not overwrite a good entry
+    if cache_ttl and _info_complete(info, need_uploader):
+        save_cached_info(cache_path, info)
+    return info
+
+
+def _preview_collection_info(
+    url: str,
+    base_out_dir: Path,
+    cfg: Dict[str, Any],
+    need_uploader: bool,
+) -> Dict[str, Optional[str]]:
+    """
+    Dry-run counterpart of _fetch_collection_info(): the URL title plus
+    whatever the info cache already holds. Never spawns yt-dlp, and says so
+    when a field the real run would look up stays unresolved.
+    """
+    info: Dict[str, Optional[str]] = {
+        "uploader":       None,
+        "playlist_title": extract_title_from_tiktok_url(url),
+    }
+    if need_uploader or not info["playlist_title"]:
+        cache_path = get_info_cache_path(base_out_dir, url)
+        cache_ttl  = cfg.get("info_cache_ttl") or 0
+        cached     = load_cached_info(cache_path, cache_ttl) if cache_ttl else None
+        if cached:
+            print(f"[tiktok-collection-dl] Collection info (cached): {cache_path}")
+            info = {
+                "uploader":       cached.get("uploader"),
+                "playlist_title": info["playlist_title"] or cached.get("playlist_title"),
+            }
+
+    wanted  = ("playlist_title", "uploader") if need_uploader else ("playlist_title",)
+    missing = [f for f in wanted if not info.get(f)]
+    if missing:
+        print(
+            f"[tiktok-collection-dl] Dry run \u2014 unresolved without yt-dlp: "
+            f"{', '.join(missing)} (the real run looks it up; preview may differ)"
+        )
+    return info
+
+
 def run(url: str, base_out_dir: Path, cfg: Dict[str, Any]) -> int:
     needs_info = cfg.get("use_collection_folder") or cfg.get("embed_collection_as_album")
+    dry_run    = cfg.get("dry_run")
 
     if needs_info:
-        print("[tiktok-collection-dl] Fetching collection info...")
-        info = get_collection_info(url)
-        print(f"[tiktok-collection-dl] uploader       : {info.get('uploader') or 'N/A'}")
-        print(f"[tiktok-collection-dl] playlist_title : {info.get('playlist_title') or 'N/A'}")
+        need_uploader = needs_uploader(cfg)
+        url_title     = extract_title_from_tiktok_url(url)
+        if dry_run:
+            info = _preview_collection_info(url, base_out_dir, cfg, need_uploader)
+        elif url_title and not need_uploader:
+            # The URL already carries everything we need — no yt-dlp probe,
+            # no cache lookup.
+            info = {"uploader": None, "playlist_title": url_title}
+        else:
+            info = _fetch_collection_info(url, base_out_dir, cfg, need_uploader)
+        _emit([
+            f"[tiktok-collection-dl] uploader       : {info.get('uploader') or 'N/A'}",
+            f"[tiktok-collection-dl] playlist_title : {info.get('playlist_title') or 'N/A'}",
+        ])
 
         if cfg.get("strip_uploader_from_collection_title"):
             info = strip_uploader_prefix(info)
     else:
-        info = {f: None for f in _SUPPORTED_FIELDS}
+        info = dict.fromkeys(_SUPPORTED_FIELDS)
+
+    diag: List[str] = []
 
     if cfg.get("use_collection_folder"):
         template    = cfg.get("collection_folder_template", "%(playlist_title)s")
         folder_name = apply_folder_template(template, info)
         out_dir     = base_out_dir / folder_name
-        print(f"[tiktok-collection-dl] folder template: {template}")
-        print(f"[tiktok-collection-dl] folder name    : {folder_name}")
+        diag.append(f"[tiktok-collection-dl] folder template: {template}")
+        diag.append(f"[tiktok-collection-dl] folder name    : {folder_name}")
     else:
         out_dir = base_out_dir
 
-    out_dir.mkdir(parents=True, exist_ok=True)
+    if not dry_run:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        migrate_legacy_archive(out_dir, url)
 
     album_name = info.get("playlist_title") if cfg.get("embed_collection_as_album") else None
     archive    = get_archive_path(out_dir, url)
     cmd        = build_command(url, out_dir, archive, cfg, album_name=album_name)
 
-    print(f"[tiktok-collection-dl] Output dir : {out_dir}")
-    print(f"[tiktok-collection-dl] Archive    : {archive}")
+    # Paths + full command are debug output: only build them when shown
+    verbose = cfg.get("verbose") or dry_run
+    if verbose:
+        diag.append(f"[tiktok-collection-dl] Output dir : {out_dir}")
+        diag.append(f"[tiktok-collection-dl] Archive    : {archive}")
     if album_name:
-        print(f"[tiktok-collection-dl] Album tag  : {album_name!r}")
-    print(f"[tiktok-collection-dl] Command    : {' '.join(cmd)}\n")
+        diag.append(f"[tiktok-collection-dl] Album tag  : {album_name!r}")
+    if verbose:
+        import shlex
+        diag.append(f"[tiktok-collection-dl] Command    : {shlex.join(cmd)}\n")
+    # Flushed before yt-dlp starts writing to the same console
+    if diag:
+        _emit(diag)
+
+    if dry_run:
+        print("[tiktok-collection-dl] Dry run \u2014 yt-dlp not started.")
+        return 0
+
+    import subprocess
 
     try:
         return subprocess.run(cmd, check=False).returncode